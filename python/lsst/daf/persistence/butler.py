@@ -1157,7 +1157,7 @@ class Butler:
         keys = None
         tag = setify(tag)
         for repoData in self._repos.inputs():
-            if not tag or len(tag.intersection(repoData.tags)) > 0:
+            if not tag or not tag.isdisjoint(repoData.tags):
                 keys = repoData.repo.getKeys(datasetType, level)
                 # An empty dict is a valid "found" condition for keys. The only value for keys that should
                 # cause the search to continue is None
@@ -1182,7 +1182,7 @@ class Butler:
         datasetTypes = set()
         tag = setify(tag)
         for repoData in self._repos.outputs() + self._repos.inputs():
-            if not tag or len(tag.intersection(repoData.tags)) > 0:
+            if not tag or not tag.isdisjoint(repoData.tags):
                 datasetTypes = datasetTypes.union(
                     repoData.repo.mappers()[0].getDatasetTypes())
         return datasetTypes
@@ -1215,7 +1215,7 @@ class Butler:
 
         tuples = None
         for repoData in self._repos.inputs():
-            if not dataId.tag or len(dataId.tag.intersection(repoData.tags)) > 0:
+            if not dataId.tag or not dataId.tag.isdisjoint(repoData.tags):
                 tuples = repoData.repo.queryMetadata(datasetType, format, dataId)
                 if tuples:
                     break
@@ -1307,7 +1307,7 @@ class Butler:
         locations = []
         for repoData in repos:
             # enforce dataId & repository tags when reading:
-            if not write and dataId.tag and len(dataId.tag.intersection(repoData.tags)) == 0:
+            if not write and dataId.tag and dataId.tag.isdisjoint(repoData.tags):
                 continue
             components = datasetType.split('.')
             datasetType = components[0]
@@ -38,6 +38,22 @@ try:
 except AttributeError:
     Loader = yaml.Loader
 
+if yaml.__with_libyaml__:
+    class _CLoader(yaml.cyaml.CParser, Loader):
+        """Parse with libyaml, but construct objects with the constructors registered on Loader.
+
+        PyYAML keeps a separate constructor table per loader class, so yaml.CUnsafeLoader would not see the
+        constructors that this and other packages register on the Python loaders; this subclass inherits
+        them.
+        """
+
+        def __init__(self, stream):
+            yaml.cyaml.CParser.__init__(self, stream)
+            yaml.constructor.BaseConstructor.__init__(self)
+            yaml.resolver.BaseResolver.__init__(self)
+
+    Loader = _CLoader
+
 
 def _write(butlerLocation, cfg):
     """Serialize a RepositoryCfg to a location.
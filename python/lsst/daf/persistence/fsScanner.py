@@ -23,11 +23,122 @@
 
 """This module provides the FsScanner class."""
 
-import glob
+import concurrent.futures
+import fnmatch
+import functools
+import itertools
 import os
 import re
 import sys
 
+from lsst.log import Log
+
+# Matches a named format substitution specification in a path template.
+_FIELD_RE = re.compile(r'%\((\w+)\).*?([dioueEfFgGcrs])')
+
+# Python type and regular expression for each template conversion type.
+_FIELD_TYPES = dict.fromkeys('crs', (str, r'[^/]+'))
+_FIELD_TYPES.update(dict.fromkeys('diou', (int, r'[-+]?\d+')))
+_FIELD_TYPES.update(dict.fromkeys('eEfFgG', (float, r'[-+]?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?')))
+
+
+@functools.lru_cache(maxsize=256)
+def _compileTemplate(pathTemplate):
+    """Derive the FsScanner attributes for a path template.
+
+    The result depends only on the template, so it is cached; butler lookups
+    construct scanners for the same few templates over and over.  All values
+    are immutable (apart from the name-to-index map, which is only read), so
+    they can be shared between scanners.
+    """
+    # Trim any trailing braces off the end of the path template.
+    if pathTemplate.endswith(']'):
+        pathTemplate = pathTemplate[0:pathTemplate.rfind('[')]
+
+    # Change template into a globbable path specification.
+    globString = _FIELD_RE.sub('*', pathTemplate)
+
+    # Change template into a regular expression, both for the whole path and
+    # split into one expression per path component.  The expressions are
+    # anchored and literal text is escaped so that each name is matched in a
+    # single pass without backtracking through alternative start offsets.
+    last = 0
+    names = []
+    types = []
+    reParts = [r'\A']
+    components = [[]]  # regex pieces of each path component
+    componentFields = [0]  # number of fields in each path component
+    n = 0
+    for m in _FIELD_RE.finditer(pathTemplate):
+        fieldName = m.group(1)
+        if fieldName in names:
+            fieldName += "_%d" % (n,)
+            n += 1
+
+        prefix = pathTemplate[last:m.start(0)]
+        last = m.end(0)
+        reParts.append(re.escape(prefix))
+        for i, piece in enumerate(prefix.split('/')):
+            if i:
+                components.append([])
+                componentFields.append(0)
+            components[-1].append(re.escape(piece))
+
+        fieldType, fieldRe = _FIELD_TYPES[m.group(2)]
+        fieldPattern = '(?P<%s>%s)' % (fieldName, fieldRe)
+        reParts.append(fieldPattern)
+        components[-1].append(fieldPattern)
+        componentFields[-1] += 1
+
+        names.append(fieldName)
+        types.append(fieldType)
+
+    suffix = pathTemplate[last:]
+    reParts.append(re.escape(suffix))
+    reParts.append(r'\Z')
+    reString = ''.join(reParts)
+    for i, piece in enumerate(suffix.split('/')):
+        if i:
+            components.append([])
+            componentFields.append(0)
+        components[-1].append(re.escape(piece))
+
+    # Split off the leading directories that contain no fields, so that the
+    # scan can start directly inside the deepest static directory.  Each
+    # remaining component becomes one state of the matcher that the scan
+    # runs against directory entries: (compiled pattern, or None for a
+    # literal component; the literal component; whether it may match hidden
+    # entries; the component's glob pattern, used to report names that have
+    # the shape of the component but whose fields do not parse).
+    templateParts = pathTemplate.split('/')
+    nLiteral = 0
+    while nLiteral < len(components) - 1 and componentFields[nLiteral] == 0:
+        nLiteral += 1
+    literalPrefix = '/'.join(templateParts[:nLiteral])
+    segments = []
+    for i in range(nLiteral, len(components)):
+        part = templateParts[i]
+        if componentFields[i]:
+            pattern = re.compile(''.join(components[i])).fullmatch
+            globMatch = re.compile(fnmatch.translate(_FIELD_RE.sub('*', part))).match
+        else:
+            pattern = globMatch = None
+        segments.append((pattern, part, part.startswith('.'), globMatch))
+
+    return dict(
+        globString=globString,
+        reString=reString,
+        rePattern=re.compile(reString),
+        _literalPrefix=literalPrefix,
+        _segments=tuple(segments),
+        _names=tuple(names),
+        _types=tuple(types),
+        # String values (filters, states, ...) repeat across many paths, so
+        # they are interned to share one object per distinct value.
+        _converters=tuple(sys.intern if t is str else t for t in types),
+        _idx={name: i for i, name in enumerate(names)},
+    )
+
 
 class FsScanner:
     """Class to scan a filesystem location for paths matching a template.
@@ -54,92 +165,186 @@ class FsScanner:
         be used. They will not be included in the filename search.
         """
 
-        # Trim any trailing braces off the end of the path template.
-        if pathTemplate.endswith(']'):
-            pathTemplate = pathTemplate[0:pathTemplate.rfind('[')]
-
-        # Change template into a globbable path specification.
-        fmt = re.compile(r'%\((\w+)\).*?([dioueEfFgGcrs])')
-
-        self.globString = fmt.sub('*', pathTemplate)
-
-        # Change template into a regular expression.
-        last = 0
-        self.fields = {}
-        self.reString = ""
-        n = 0
-        pos = 0
-        for m in fmt.finditer(pathTemplate):
-            fieldName = m.group(1)
-            if fieldName in self.fields:
-                fieldName += "_%d" % (n,)
-                n += 1
-
-            prefix = pathTemplate[last:m.start(0)]
-            last = m.end(0)
-            self.reString += prefix
-
-            if m.group(2) in 'crs':
-                fieldType = str
-                self.reString += r'(?P<' + fieldName + '>.+)'
-            elif m.group(2) in 'eEfFgG':
-                fieldType = float
-                self.reString += r'(?P<' + fieldName + r'>[\d.eE+-]+)'
-            else:
-                fieldType = int
-                self.reString += r'(?P<' + fieldName + r'>[\d+-]+)'
-
-            self.fields[fieldName] = dict(pos=pos, fieldType=fieldType)
-            pos += 1
-
-        self.reString += pathTemplate[last:]
+        self._pathTemplate = pathTemplate
+        self.__dict__.update(_compileTemplate(pathTemplate))
 
     def getFields(self):
         """Return the list of fields that will be returned from matched
         paths, in order."""
 
-        fieldList = ["" for i in range(len(self.fields))]
-        for f in list(self.fields.keys()):
-            fieldList[self.fields[f]['pos']] = f
-        return fieldList
+        return list(self._names)
 
     def isNumeric(self, name):
         """Return true if the given field contains a number."""
 
-        return self.fields[name]['fieldType'] in (float, int)
+        return self._types[self._idx[name]] in (float, int)
 
     def isInt(self, name):
         """Return true if the given field contains an integer."""
 
-        return self.fields[name]['fieldType'] == int
+        return self._types[self._idx[name]] is int
 
     def isFloat(self, name):
         """Return true if the given field contains an float."""
 
-        return self.fields[name]['fieldType'] == float
+        return self._types[self._idx[name]] is float
 
-    def processPath(self, location):
+    def processPath(self, location, processes=1):
         """
         Scan a given path location. Return info about paths that conform to the path template:
         :param location:
+        :param processes: number of worker processes to split the directory walk across; the default
+            scans in the calling process.
         :return: Path info: {path: {key:value ...}, ...} e.g.:
             {'0239622/instcal0239622.fits.fz': {'visit_0': 239622, 'visit': 239622}}
         """
-        ret = {}
-        curdir = os.getcwd()
-        os.chdir(location)
-        pathList = glob.glob(self.globString)
-        for path in pathList:
-            m = re.search(self.reString, path)
-            if m:
-                dataId = m.groupdict()
-                for f in self.fields:
-                    if self.isInt(f):
-                        dataId[f] = int(dataId[f])
-                    elif self.isFloat(f):
-                        dataId[f] = float(dataId[f])
-                ret[path] = dataId
+        return dict(self.iterPaths(location, processes))
+
+    def iterPaths(self, location, processes=1):
+        """
+        Scan a given path location, yielding info about each path that conforms to the path template
+        as it is found:
+        :param location:
+        :param processes: number of worker processes to split the directory walk across; the default
+            scans in the calling process.
+        :return: iterator of (path, {key:value ...}) e.g.:
+            ('0239622/instcal0239622.fits.fz', {'visit_0': 239622, 'visit': 239622})
+        """
+        names = self._names
+        converters = self._converters
+        for path, values in self._iterMatches(location, processes):
+            yield path, dict(zip(names, [conv(value) for conv, value in zip(converters, values)]))
+
+    def processPathArrays(self, location, processes=1):
+        """
+        Scan a given path location. Return info about paths that conform to the path template, as
+        columns rather than as one dict per path:
+        :param location:
+        :param processes: number of worker processes to split the directory walk across; the default
+            scans in the calling process.
+        :return: (paths, columns) where paths is the list of matched paths and columns is
+            {key: numpy.ndarray, ...} holding the value of each field for each path, with dtype
+            int64, float64 or object for integer, float and string fields respectively. e.g.:
+            (['0239622/instcal0239622.fits.fz'],
+             {'visit': array([239622]), 'visit_0': array([239622])})
+        """
+        # numpy is not a dependency of this package, so it is only imported
+        # when columns are requested.
+        import numpy
+
+        paths = []
+        rows = []
+        for path, values in self._iterMatches(location, processes):
+            paths.append(path)
+            rows.append(values)
+        # Numeric columns are filled straight from the converted values with
+        # numpy.fromiter, without building a list or a string array first.
+        columns = list(zip(*rows)) if rows else [()] * len(self._names)
+        arrays = {}
+        for name, fieldType, conv, column in zip(self._names, self._types, self._converters, columns):
+            if fieldType is str:
+                arrays[name] = numpy.array([conv(value) for value in column], dtype=object)
             else:
-                print("Warning: unmatched path: %s" % (path,), file=sys.stderr)
-        os.chdir(curdir)
-        return ret
+                dtype = numpy.int64 if fieldType is int else numpy.float64
+                arrays[name] = numpy.fromiter(map(conv, column), dtype, count=len(column))
+        return paths, arrays
+
+    def _iterMatches(self, location, processes=1):
+        """Yield (path, values) for each path under location that conforms to
+        the template, where values is the tuple of matched field strings in
+        the order of getFields().
+
+        With more than one process, the top of the tree is expanded here until
+        there are enough subdirectories to go round, and the subtrees are then
+        walked in a process pool.
+        """
+        root = (os.path.join(location, self._literalPrefix), self._literalPrefix, 0, ())
+        if processes <= 1:
+            yield from self._walk(root)
+            return
+
+        frames = [root]
+        while frames and len(frames) < processes:
+            children = []
+            for frame in frames:
+                matches, subFrames = self._expand(frame)
+                yield from matches
+                children.extend(subFrames)
+            frames = children
+        if not frames:
+            return
+        with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+            chunksize = max(1, len(frames) // (4*processes))
+            for matches in executor.map(_walkFrame, itertools.repeat(self._pathTemplate), frames,
+                                        chunksize=chunksize):
+                yield from matches
+
+    def _walk(self, frame):
+        """Yield (path, values) for each match in the subtree described by
+        frame, walking it depth first.
+        """
+        stack = [frame]
+        while stack:
+            matches, frames = self._expand(stack.pop())
+            yield from matches
+            stack.extend(frames)
+
+    def _expand(self, frame):
+        """Process one directory of the walk.
+
+        frame is (directory path, path relative to the scan location,
+        template level, field strings captured so far).  Returns the list of
+        (path, values) matches found in the directory and the list of frames
+        for the subdirectories to descend into.
+
+        The directory is listed with os.scandir and each entry name is matched
+        against the expression for this template level, which also captures
+        the fields it contains; only entries that can still lead to a match
+        are descended into.  As with glob, fields do not match names beginning
+        with '.'.  Names that match the glob form of the template level but
+        whose fields do not parse are reported as unmatched paths.
+        """
+        dirPath, relPath, depth, captured = frame
+        isLast = depth == len(self._segments) - 1
+        matches = []
+        frames = []
+        match, part, matchHidden, globMatch = self._segments[depth]
+        if match is None:
+            # Literal component: a single lookup instead of a listing.
+            entryPath = os.path.join(dirPath, part)
+            rel = relPath + '/' + part if relPath else part
+            if isLast:
+                if os.path.lexists(entryPath):
+                    matches.append((rel, captured))
+            elif os.path.isdir(entryPath):
+                frames.append((entryPath, rel, depth + 1, captured))
+            return matches, frames
+        try:
+            with os.scandir(dirPath) as it:
+                entries = list(it)
+        except OSError:
+            return matches, frames
+        for entry in entries:
+            name = entry.name
+            if name[0] == '.' and not matchHidden:
+                continue
+            m = match(name)
+            if m is None:
+                if globMatch(name) is not None and (isLast or entry.is_dir()):
+                    log = Log.getLogger("daf.persistence.butler")
+                    log.warn("Unmatched path: %s", relPath + '/' + name if relPath else name)
+                continue
+            rel = relPath + '/' + name if relPath else name
+            if isLast:
+                matches.append((rel, captured + m.groups()))
+            elif entry.is_dir():
+                frames.append((entry.path, rel, depth + 1, captured + m.groups()))
+        return matches, frames
+
+
+def _walkFrame(pathTemplate, frame):
+    """Process pool worker for FsScanner: return the list of matches in the
+    subtree described by frame.  The scanner is rebuilt from its template,
+    which is cheap because template compilation is cached.
+    """
+    return list(FsScanner(pathTemplate)._walk(frame))
@@ -111,11 +111,12 @@ class Policy(_PolicyBase):
         :param path:
         :return:
         """
-        with open(path, 'r') as f:
-            self.__initFromYaml(f)
+        # Read the bytes in one go; yaml detects the encoding itself.
+        with open(path, 'rb', buffering=0) as f:
+            self.__initFromYaml(f.read())
 
     def __initFromYaml(self, stream):
-        """Loads a YAML policy from any readable stream that contains one.
+        """Loads a YAML policy from any readable stream, string or bytes that contains one.
 
         :param stream:
         :return:
@@ -21,9 +21,12 @@
 # the GNU General Public License along with this program.  If not,
 # see <http://www.lsstcorp.org/LegalNotices/>.
 #
-import sys
+import copy
+import errno
 import pickle
+import functools
 import importlib
+import mmap
 import os
 import re
 import urllib.parse
@@ -40,6 +43,77 @@ from .safeFileIo import SafeFilename, safeMakeDir
 
 __all__ = ["PosixStorage"]
 
+# Results of probing repository roots for the files that describe them (_mapper, _parent, ...), so that
+# walking the same repositories repeatedly in a session does not repeat the probes. Maps the normalized
+# root path to ((st_dev, st_ino, st_mtime_ns) of the root directory, {probe name: result}); an entry is
+# discarded when the directory's mtime changes, i.e. when entries are added to or removed from it, or when
+# root is another directory than before (it was recreated, or a symlink to it was retargeted). Only results
+# that depend on nothing but root's own entries may be kept here without further checks; a result that
+# depends on the contents of a file must also be checked against that file.
+_repoMetaCache = {}
+
+
+def _getRepoMeta(root):
+    """Get the cached probe results for a repository root.
+
+    Parameters
+    ----------
+    root : string
+        A path to a folder on the local filesystem.
+
+    Returns
+    -------
+    dict or None
+        The probe results cached for root, which callers may add to, or None if root does not exist.
+    """
+    root = os.path.normpath(root)
+    try:
+        stat = os.stat(root)
+    except OSError:
+        return None
+    key = (stat.st_dev, stat.st_ino, stat.st_mtime_ns)
+    entry = _repoMetaCache.get(root)
+    if entry is None or entry[0] != key:
+        entry = (key, {})
+        _repoMetaCache[root] = entry
+    return entry[1]
+
+
+def _invalidateRepoMeta(root):
+    """Discard the cached probe results for a repository root."""
+    _repoMetaCache.pop(os.path.normpath(root), None)
+    _repoCfgCache.pop(os.path.normpath(os.path.join(root, 'repositoryCfg.yaml')), None)
+
+
+# RepositoryCfgs that have been read, so that walking parent chains does not re-parse the same files. Maps
+# the normalized path of a repositoryCfg.yaml file to ((st_ino, st_size, st_mtime_ns) of the file when it
+# was read, and the root it was read through; RepositoryCfg). RepositoryCfg is mutable, so copies are handed
+# out.
+_repoCfgCache = {}
+
+
+@functools.lru_cache(maxsize=4096)
+def _realpath(path):
+    """Cached os.path.realpath; the same repository roots are resolved many times while butlers are built.
+
+    Parameters
+    ----------
+    path : string
+        An absolute path (relative paths would depend on the working directory at the time of the call).
+
+    Returns
+    -------
+    string
+        The canonical path of path.
+    """
+    return os.path.realpath(path)
+
+
+# Number of paths sharing a parent directory above which PosixStorage._anyExists lists the directory
+# instead of checking each path with lstat. A listing costs about as much as one lstat per five entries, so
+# it is only worth it for many paths in one directory.
+_LIST_DIR_THRESHOLD = 256
+
 
 class PosixStorage(StorageInterface):
     """Defines the interface for a storage location on the local filesystem.
@@ -62,6 +136,14 @@ class PosixStorage(StorageInterface):
     def __init__(self, uri, create):
         self.log = Log.getLogger("daf.persistence.butler")
         self.root = self._pathFromURI(uri)
+        # Joining against a precomputed prefix is cheaper than os.path.join on every access.
+        self._rootPrefix = os.path.join(self.root, '')
+        # root as search() normalizes it, so instance searches do not redo the work.
+        self._rootDir = self.root.rstrip('/') or self.root[:1]
+        # The class's live formatter registries, so read and write can index them directly; formatters
+        # registered later are still seen.
+        self._readers = self._readFormatters()
+        self._writers = self._writeFormatters()
         if self.root and not os.path.exists(self.root):
             if not create:
                 raise NoRepositroyAtRoot("No repository at {}".format(uri))
@@ -92,7 +174,7 @@ class PosixStorage(StorageInterface):
         string
             A relative path that describes the path from fromPath to toPath.
         """
-        fromPath = os.path.realpath(fromPath)
+        fromPath = _realpath(os.path.abspath(fromPath))
         return os.path.relpath(toPath, fromPath)
 
     @staticmethod
@@ -117,7 +199,7 @@ class PosixStorage(StorageInterface):
         """
         if os.path.isabs(relativePath):
             return relativePath
-        fromPath = os.path.realpath(fromPath)
+        fromPath = _realpath(os.path.abspath(fromPath))
         return os.path.normpath(os.path.join(fromPath, relativePath))
 
     @staticmethod
@@ -143,7 +225,21 @@ class PosixStorage(StorageInterface):
                                   storage=storage,
                                   usedDataId=None,
                                   datasetType=None)
-        return storage.read(location)
+        cfgPath = os.path.normpath(os.path.join(storage.root, 'repositoryCfg.yaml'))
+        try:
+            stat = os.stat(cfgPath)
+        except OSError:
+            return storage.read(location)
+        # A cfg that does not record its root gets the root it was read through, so the cached cfg is
+        # only handed out to callers that spell the root the same way.
+        key = (stat.st_ino, stat.st_size, stat.st_mtime_ns, storage.root)
+        cached = _repoCfgCache.get(cfgPath)
+        if cached is not None and cached[0] == key:
+            return copy.deepcopy(cached[1])
+        cfg = storage.read(location)
+        if cfg is not None:
+            _repoCfgCache[cfgPath] = (key, copy.deepcopy(cfg))
+        return cfg
 
     @staticmethod
     def putRepositoryCfg(cfg, loc=None):
@@ -158,6 +254,7 @@ class PosixStorage(StorageInterface):
                                   usedDataId=None,
                                   datasetType=None)
         storage.write(location, cfg)
+        _invalidateRepoMeta(storage.root)
 
     @staticmethod
     def getMapperClass(root):
@@ -184,6 +281,18 @@ class PosixStorage(StorageInterface):
         if cfg is not None:
             return cfg.mapper
 
+        # The cached class is only valid while root/_mapper is the same file as when it was read; a class
+        # found through a _parent link, which lives in another directory, is not cached.
+        meta = _getRepoMeta(root)
+        if meta is not None and 'mapper' in meta:
+            key, mapperClass = meta['mapper']
+            try:
+                stat = os.stat(os.path.join(root, "_mapper"))
+            except OSError:
+                stat = None
+            if key == (None if stat is None else (stat.st_ino, stat.st_size, stat.st_mtime_ns)):
+                return mapperClass
+
         # Find a "_mapper" file containing the mapper class name
         basePath = root
         mapperFile = "_mapper"
@@ -195,20 +304,31 @@ class PosixStorage(StorageInterface):
                 mapperFile = None
                 break
 
+        mapperClass = None
+        key = None
         if mapperFile is not None:
             mapperFile = os.path.join(basePath, mapperFile)
 
-            # Read the name of the mapper class and instantiate it
-            with open(mapperFile, "r") as f:
-                mapperName = f.readline().strip()
+            # Read the name of the mapper class and instantiate it. The file is tiny, so read it with one
+            # unbuffered read rather than through a text stream.
+            fd = os.open(mapperFile, os.O_RDONLY | os.O_CLOEXEC)
+            try:
+                stat = os.fstat(fd)
+                data = os.read(fd, 4096)
+            finally:
+                os.close(fd)
+            key = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            mapperName = data.split(b"\n", 1)[0].decode().strip()
             components = mapperName.split(".")
             if len(components) <= 1:
                 raise RuntimeError("Unqualified mapper name %s in %s" %
                                    (mapperName, mapperFile))
             pkg = importlib.import_module(".".join(components[:-1]))
-            return getattr(pkg, components[-1])
+            mapperClass = getattr(pkg, components[-1])
 
-        return None
+        if meta is not None and basePath == root:
+            meta['mapper'] = (key, mapperClass)
+        return mapperClass
 
     @staticmethod
     def getParentSymlinkPath(root):
@@ -226,15 +346,21 @@ class PosixStorage(StorageInterface):
             A path to the parent folder indicated by the _parent symlink, or None if there is no _parent
             symlink at root.
         """
-        linkpath = os.path.join(root, '_parent')
-        if os.path.exists(linkpath):
+        meta = _getRepoMeta(root)
+        if meta is None:
+            return None
+        if 'parent' not in meta:
+            linkpath = os.path.join(root, '_parent')
             try:
-                return os.readlink(os.path.join(root, '_parent'))
+                parent = os.readlink(linkpath)
+            except FileNotFoundError:
+                parent = None
             except OSError:
                 # some of the unit tests rely on a folder called _parent instead of a symlink to aother
                 # location. Allow that; return the path of that folder.
-                return os.path.join(root, '_parent')
-        return None
+                parent = linkpath if os.path.isdir(linkpath) else None
+            meta['parent'] = parent
+        return meta['parent']
 
     def write(self, butlerLocation, obj):
         """Writes an object to a location and persistence format specified by
@@ -249,9 +375,10 @@ class PosixStorage(StorageInterface):
         """
         self.log.debug("Put location=%s obj=%s", butlerLocation, obj)
 
-        writeFormatter = self.getWriteFormatter(butlerLocation.getStorageName())
+        writers = self._writers
+        writeFormatter = writers.get(butlerLocation.getStorageName())
         if not writeFormatter:
-            writeFormatter = self.getWriteFormatter(butlerLocation.getPythonType())
+            writeFormatter = writers.get(butlerLocation.getPythonType())
         if writeFormatter:
             writeFormatter(butlerLocation, obj)
             return
@@ -271,9 +398,10 @@ class PosixStorage(StorageInterface):
         A list of objects as described by the butler location. One item for
         each location in butlerLocation.getLocations()
         """
-        readFormatter = self.getReadFormatter(butlerLocation.getStorageName())
+        readers = self._readers
+        readFormatter = readers.get(butlerLocation.getStorageName())
         if not readFormatter:
-            readFormatter = self.getReadFormatter(butlerLocation.getPythonType())
+            readFormatter = readers.get(butlerLocation.getPythonType())
         if readFormatter:
             return readFormatter(butlerLocation)
 
@@ -288,13 +416,72 @@ class PosixStorage(StorageInterface):
                                'YamlStorage', 'ParquetStorage', 'MatplotlibStorage'):
             self.log.warn("butlerLocationExists for non-supported storage %s" % location)
             return False
-        for locationString in location.getLocations():
+        locationStrings = location.getLocations()
+        if len(locationStrings) > 1:
+            additionalData = location.getAdditionalData()
+            return self._anyExists([LogicalLocation(locationString, additionalData).locString()
+                                    for locationString in locationStrings])
+        for locationString in locationStrings:
             logLoc = LogicalLocation(locationString, location.getAdditionalData()).locString()
-            obj = self.instanceSearch(path=logLoc)
-            if obj:
+            found = self._fastExists(logLoc)
+            if found is None:
+                found = bool(self.instanceSearch(path=logLoc))
+            if found:
                 return True
         return False
 
+    def _anyExists(self, paths):
+        """Check if any of several paths exists in this storage.
+
+        The paths are checked in order, stopping at the first one found. Relative paths without wildcards
+        are checked with a single lstat, unless more than _LIST_DIR_THRESHOLD of them share a parent
+        directory, in which case that directory is listed once with os.scandir instead; other paths are
+        searched for with instanceSearch. Any HDU indicator is ignored.
+
+        Parameters
+        ----------
+        paths : list of string
+            Filenames (and optionally prefix paths) within root.
+
+        Returns
+        -------
+        bool
+            True if any of the paths exists, else False.
+        """
+        checks = []
+        counts = {}
+        for path in paths:
+            strippedPath = path.partition('[')[0]
+            if path.startswith('/') or glob.has_magic(strippedPath):
+                checks.append((path, None, None))
+                continue
+            parent, name = os.path.split(self._rootPrefix + strippedPath)
+            checks.append((path, parent, name))
+            counts[parent] = counts.get(parent, 0) + 1
+        listings = {}
+        for path, parent, name in checks:
+            if parent is None:
+                if self.instanceSearch(path=path):
+                    return True
+                continue
+            if counts[parent] > _LIST_DIR_THRESHOLD and name not in ('', '.', '..'):
+                if parent not in listings:
+                    try:
+                        with os.scandir(parent or '.') as entries:
+                            listings[parent] = {entry.name for entry in entries}
+                    except OSError:
+                        listings[parent] = None
+                if listings[parent] is not None:
+                    if name in listings[parent]:
+                        return True
+                    continue
+            try:
+                os.lstat(os.path.join(parent, name))
+            except OSError:
+                continue
+            return True
+        return False
+
     def exists(self, location):
         """Check if location exists.
 
@@ -312,8 +499,35 @@ class PosixStorage(StorageInterface):
         if isinstance(location, ButlerLocation):
             return self.butlerLocationExists(location)
 
-        obj = self.instanceSearch(path=location)
-        return bool(obj)
+        found = self._fastExists(location)
+        if found is None:
+            found = bool(self.instanceSearch(path=location))
+        return found
+
+    def _fastExists(self, path):
+        """Check if a path exists in this storage with a single lstat, if possible.
+
+        Handles the common case of a relative path without wildcards, with the same result as searching for
+        it with instanceSearch; any HDU indicator is ignored.
+
+        Parameters
+        ----------
+        path : string
+            A filename (and optionally prefix path) within root.
+
+        Returns
+        -------
+        bool or None
+            True or False if the path could be checked directly, or None if it needs a full search.
+        """
+        strippedPath = path.partition('[')[0]
+        if path.startswith('/') or glob.has_magic(strippedPath):
+            return None
+        try:
+            os.lstat(self._rootPrefix + strippedPath)
+        except OSError:
+            return False
+        return True
 
     def locationWithRoot(self, location):
         """Get the full path to the location.
@@ -321,7 +535,9 @@ class PosixStorage(StorageInterface):
         :param location:
         :return:
         """
-        return os.path.join(self.root, location)
+        if location.startswith('/'):
+            return location
+        return self._rootPrefix + location
 
     @staticmethod
     def v1RepoExists(root):
@@ -341,11 +557,18 @@ class PosixStorage(StorageInterface):
         bool
             True if the repository at root exists, else False.
         """
-        return os.path.exists(root) and (
-            os.path.exists(os.path.join(root, "registry.sqlite3"))
-            or os.path.exists(os.path.join(root, "_mapper"))
-            or os.path.exists(os.path.join(root, "_parent"))
-        )
+        meta = _getRepoMeta(root)
+        if meta is None:
+            return False
+        if 'v1' not in meta:
+            # One directory listing instead of a stat per candidate file.
+            try:
+                with os.scandir(root) as entries:
+                    meta['v1'] = any(entry.name in ("registry.sqlite3", "_mapper", "_parent")
+                                     for entry in entries)
+            except OSError:
+                meta['v1'] = False
+        return meta['v1']
 
     def copyFile(self, fromLocation, toLocation):
         """Copy a file from one location to another on the local filesystem.
@@ -361,15 +584,25 @@ class PosixStorage(StorageInterface):
         -------
         None
         """
-        shutil.copy(os.path.join(self.root, fromLocation), os.path.join(self.root, toLocation))
-
-    def getLocalFile(self, path):
+        src = self.locationWithRoot(fromLocation)
+        dst = self.locationWithRoot(toLocation)
+        if os.path.isdir(dst):
+            dst = os.path.join(dst, os.path.basename(src))
+        _copyFileData(src, dst)
+        shutil.copymode(src, dst)
+
+    def getLocalFile(self, path, binary=False):
         """Get a handle to a local copy of the file, downloading it to a
         temporary if needed.
 
         Parameters
         ----------
-        A path the the file in storage, relative to root.
+        path : string
+            A path the the file in storage, relative to root.
+        binary : bool, optional
+            If True the file is opened in binary mode, which avoids the cost
+            of setting up text decoding when the caller only needs the bytes
+            or the file name.
 
         Returns
         -------
@@ -378,9 +611,9 @@ class PosixStorage(StorageInterface):
         a temporary file. The file name can be gotten via the 'name' property
         of the returned object.
         """
-        p = os.path.join(self.root, path)
+        p = self.locationWithRoot(path)
         try:
-            return open(p)
+            return open(p, 'rb' if binary else 'r')
         except IOError as e:
             if e.errno == 2:  # 'No such file or directory'
                 return None
@@ -405,7 +638,7 @@ class PosixStorage(StorageInterface):
         string or None
             The location that was found, or None if no location was found.
         """
-        return self.search(self.root, path)
+        return self.search(self._rootDir, path)
 
     @staticmethod
     def search(root, path, searchParents=False):
@@ -439,26 +672,26 @@ class PosixStorage(StorageInterface):
         """
         # Separate path into a root-equivalent prefix (in dir) and the rest
         # (left in path)
-        rootDir = root
-        # First remove trailing slashes (#2527)
-        while len(rootDir) > 1 and rootDir[-1] == '/':
-            rootDir = rootDir[:-1]
+        # First remove trailing slashes (#2527), keeping a bare "/"
+        rootDir = root.rstrip('/') or root[:1]
+        rootPrefix = rootDir + '/'
 
         if not path.startswith('/'):
             # Most common case is a relative path from a template
             pathPrefix = None
-        elif path.startswith(rootDir + "/"):
+        elif path.startswith(rootPrefix):
             # Common case; we have the same root prefix string
-            path = path[len(rootDir + '/'):]
+            path = path[len(rootPrefix):]
             pathPrefix = rootDir
         elif rootDir == "/" and path.startswith("/"):
             path = path[1:]
             pathPrefix = None
         else:
-            # Search for prefix that is the same as root
+            # Search for prefix that is the same as root; root is resolved only once
+            rootReal = _realpath(os.path.abspath(root))
             pathPrefix = os.path.dirname(path)
             while pathPrefix != "" and pathPrefix != "/":
-                if os.path.realpath(pathPrefix) == os.path.realpath(root):
+                if os.path.realpath(pathPrefix) == rootReal:
                     break
                 pathPrefix = os.path.dirname(pathPrefix)
             if pathPrefix == "/":
@@ -468,19 +701,22 @@ class PosixStorage(StorageInterface):
 
         # Now search for the path in the root or its parents
         # Strip off any cfitsio bracketed extension if present
-        strippedPath = path
-        pathStripped = None
-        firstBracket = path.find("[")
-        if firstBracket != -1:
-            strippedPath = path[:firstBracket]
-            pathStripped = path[firstBracket:]
+        strippedPath, bracket, extension = path.partition("[")
+        pathStripped = bracket + extension if bracket else None
 
+        # Templated paths are almost always literal; only pay for glob when
+        # there is a wildcard to expand.
+        hasWildcards = glob.has_magic(strippedPath)
         dir = rootDir
         while True:
-            paths = glob.glob(os.path.join(dir, strippedPath))
+            if hasWildcards:
+                paths = glob.glob(os.path.join(glob.escape(dir), strippedPath))
+            else:
+                fullPath = os.path.join(dir, strippedPath)
+                paths = [fullPath] if os.path.lexists(fullPath) else []
             if len(paths) > 0:
                 if pathPrefix != rootDir:
-                    paths = [p[len(rootDir+'/'):] for p in paths]
+                    paths = [p[len(rootPrefix):] for p in paths]
                 if pathStripped is not None:
                     paths = [p + pathStripped for p in paths]
                 return paths
@@ -508,6 +744,77 @@ class PosixStorage(StorageInterface):
         return os.path.exists(PosixStorage._pathFromURI(uri))
 
 
+# Largest number of bytes requested from each os.copy_file_range call.
+_COPY_CHUNK_SIZE = 1 << 30
+
+
+def _copyFileData(src, dst):
+    """Copy the contents of one file to another, inside the kernel where possible.
+
+    Uses os.copy_file_range, which lets the filesystem share or copy the data without passing it through
+    user space. If that is not supported for these files, or it does not copy the whole file (some
+    filesystems report success without copying anything), the copy is redone with shutil.copyfile.
+
+    Parameters
+    ----------
+    src : string
+        Path of the existing file.
+    dst : string
+        Path of the file to create or overwrite.
+
+    Raises
+    ------
+    shutil.SameFileError
+        If src and dst are the same file; opening dst for writing would truncate it.
+    """
+    try:
+        if os.path.samefile(src, dst):
+            raise shutil.SameFileError("{!r} and {!r} are the same file".format(src, dst))
+    except FileNotFoundError:
+        pass
+    if hasattr(os, 'copy_file_range'):
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            size = os.fstat(fsrc.fileno()).st_size
+            copied = 0
+            try:
+                while copied < size:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), min(size - copied, _COPY_CHUNK_SIZE))
+                    if n == 0:
+                        break
+                    copied += n
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM):
+                    raise
+        if size > 0 and copied == size:
+            return
+    shutil.copyfile(src, dst)
+
+
+@functools.lru_cache(maxsize=1024)
+def _importType(name):
+    """Cached doImport, so that reading many datasets of a type does not repeat the import lookup."""
+    return doImport(name)
+
+
+def _getPythonType(butlerLocation):
+    """Get the python type of a ButlerLocation, importing it if it is given by name.
+
+    Parameters
+    ----------
+    butlerLocation : ButlerLocation
+        The location whose python type is wanted.
+
+    Returns
+    -------
+    class or None
+        The python type, or None if the location does not have one.
+    """
+    pythonType = butlerLocation.getPythonType()
+    if isinstance(pythonType, str):
+        pythonType = _importType(pythonType)
+    return pythonType
+
+
 def readConfigStorage(butlerLocation):
     """Read an lsst.pex.config.Config from a butlerLocation.
 
@@ -527,10 +834,7 @@ def readConfigStorage(butlerLocation):
         logLoc = LogicalLocation(locStringWithRoot, butlerLocation.getAdditionalData())
         if not os.path.exists(logLoc.locString()):
             raise RuntimeError("No such config file: " + logLoc.locString())
-        pythonType = butlerLocation.getPythonType()
-        if pythonType is not None:
-            if isinstance(pythonType, str):
-                pythonType = doImport(pythonType)
+        pythonType = _getPythonType(butlerLocation)
         finalItem = pythonType()
         finalItem.load(logLoc.locString())
         results.append(finalItem)
@@ -572,10 +876,7 @@ def readFitsStorage(butlerLocation):
     A list of objects as described by the butler location. One item for
     each location in butlerLocation.getLocations()
     """
-    pythonType = butlerLocation.getPythonType()
-    if pythonType is not None:
-        if isinstance(pythonType, str):
-            pythonType = doImport(pythonType)
+    pythonType = _getPythonType(butlerLocation)
     supportsOptions = hasattr(pythonType, "readFitsWithOptions")
     if not supportsOptions:
         from lsst.daf.base import PropertySet, PropertyList
@@ -663,10 +964,7 @@ def readParquetStorage(butlerLocation):
         if not os.path.exists(logLoc.locString()):
             raise RuntimeError("No such parquet file: " + logLoc.locString())
 
-        pythonType = butlerLocation.getPythonType()
-        if pythonType is not None:
-            if isinstance(pythonType, str):
-                pythonType = doImport(pythonType)
+        pythonType = _getPythonType(butlerLocation)
 
         filename = logLoc.locString()
 
@@ -714,6 +1012,37 @@ def writeYamlStorage(butlerLocation, obj):
             yaml.dump(obj, outfile)
 
 
+# Buffer size for reading and writing pickle files; the default 8 KiB costs a syscall per few objects of a
+# large pickle.
+_PICKLE_BUFFER_SIZE = 1 << 20
+
+# Pickle files at least this large are read through a memory map of the file instead of read() calls.
+_PICKLE_MMAP_THRESHOLD = 16 << 20
+
+
+def _openPickle(path):
+    """Open a pickle file for reading.
+
+    Parameters
+    ----------
+    path : string
+        The path of the pickle file.
+
+    Returns
+    -------
+    file-like object
+        A binary file with a large buffer, or for large files a read-only memory map of the file. Either
+        can be used as a context manager and passed to pickle.load.
+    """
+    infile = open(path, "rb", buffering=_PICKLE_BUFFER_SIZE)
+    if os.fstat(infile.fileno()).st_size < _PICKLE_MMAP_THRESHOLD:
+        return infile
+    try:
+        return mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+    finally:
+        infile.close()
+
+
 def readPickleStorage(butlerLocation):
     """Read an object from a pickle file specified by ButlerLocation.
 
@@ -733,16 +1062,15 @@ def readPickleStorage(butlerLocation):
     for locationString in butlerLocation.getLocations():
         locStringWithRoot = os.path.join(butlerLocation.getStorage().root, locationString)
         logLoc = LogicalLocation(locStringWithRoot, additionalData)
-        if not os.path.exists(logLoc.locString()):
+        try:
+            infile = _openPickle(logLoc.locString())
+        except FileNotFoundError:
             raise RuntimeError("No such pickle file: " + logLoc.locString())
-        with open(logLoc.locString(), "rb") as infile:
-            # py3: We have to specify encoding since some files were written
+        with infile:
+            # We have to specify encoding since some files were written
             # by python2, and 'latin1' manages that conversion safely. See:
             # http://stackoverflow.com/questions/28218466/unpickling-a-python-2-object-with-python-3/28218598#28218598
-            if sys.version_info.major >= 3:
-                finalItem = pickle.load(infile, encoding="latin1")
-            else:
-                finalItem = pickle.load(infile)
+            finalItem = pickle.load(infile, encoding="latin1")
         results.append(finalItem)
     return results
 
@@ -761,7 +1089,7 @@ def writePickleStorage(butlerLocation, obj):
     locations = butlerLocation.getLocations()
     with SafeFilename(os.path.join(butlerLocation.getStorage().root, locations[0])) as locationString:
         logLoc = LogicalLocation(locationString, additionalData)
-        with open(logLoc.locString(), "wb") as outfile:
+        with open(logLoc.locString(), "wb", buffering=_PICKLE_BUFFER_SIZE) as outfile:
             pickle.dump(obj, outfile, pickle.HIGHEST_PROTOCOL)
 
 
@@ -778,23 +1106,24 @@ def readFitsCatalogStorage(butlerLocation):
     A list of objects as described by the butler location. One item for
     each location in butlerLocation.getLocations()
     """
-    pythonType = butlerLocation.getPythonType()
-    if pythonType is not None:
-        if isinstance(pythonType, str):
-            pythonType = doImport(pythonType)
+    pythonType = _getPythonType(butlerLocation)
     results = []
     additionalData = butlerLocation.getAdditionalData()
     for locationString in butlerLocation.getLocations():
         locStringWithRoot = os.path.join(butlerLocation.getStorage().root, locationString)
         logLoc = LogicalLocation(locStringWithRoot, additionalData)
-        if not os.path.exists(logLoc.locString()):
-            raise RuntimeError("No such FITS catalog file: " + logLoc.locString())
         kwds = {}
         if additionalData.exists("hdu"):
             kwds["hdu"] = additionalData.getInt("hdu")
         if additionalData.exists("flags"):
             kwds["flags"] = additionalData.getInt("flags")
-        finalItem = pythonType.readFits(logLoc.locString(), **kwds)
+        try:
+            finalItem = pythonType.readFits(logLoc.locString(), **kwds)
+        except Exception as e:
+            # Only look for the file once reading it has failed, rather than before every read.
+            if not os.path.exists(logLoc.locString()):
+                raise RuntimeError("No such FITS catalog file: " + logLoc.locString()) from e
+            raise
         results.append(finalItem)
     return results
 
@@ -221,9 +221,8 @@ class PosixRegistry(Registry):
 
         lookupData = PosixRegistry.LookupData(lookupProperties, dataId)
         scanner = fsScanner.FsScanner(template)
-        allPaths = scanner.processPath(self.root)
         retItems = []  # one item for each found file that matches
-        for path, foundProperties in allPaths.items():
+        for path, foundProperties in scanner.iterPaths(self.root):
             # check for dataId keys that are not present in found properties
             # search for those keys in metadata of file at path
             # if present, check for matching values
@@ -21,13 +21,30 @@
 # the GNU General Public License along with this program.  If not,
 # see <http://www.lsstcorp.org/LegalNotices/>.
 #
-import copy
-import inspect
 import os
 
 from lsst.daf.persistence import Storage, listify, doImport, Policy
 
 
+# Mapper classes imported by name, so that making many repositories with the same mapper imports it once.
+_mapperClassCache = {}
+
+
+def _returnNone(*args, **kwargs):
+    """Stands in for the mapper methods of a Repository that has no mapper."""
+    return None
+
+
+def _raiseNoMapper(*args, **kwargs):
+    """Stands in for mapper.map in a Repository that has no mapper."""
+    raise RuntimeError("No mapper assigned to Repository")
+
+
+# Attributes of Repository that hold bound methods of its mapper, and the names of those methods.
+_mapperMethods = {'_mapperMap': 'map', '_mapperGetKeys': 'getKeys', '_mapperQueryMetadata': 'queryMetadata',
+                  '_mapperBackup': 'backup'}
+
+
 class RepositoryArgs:
 
     """Arguments passed into a Butler that are used to instantiate a repository. This includes arguments that
@@ -65,6 +82,8 @@ class RepositoryArgs:
         Policy associated with this repository, overrides all other policy data (which may be loaded from
         policies in derived packages).
     """
+    __slots__ = ('_root', '_cfgRoot', '_mapper', 'mapperArgs', 'tags', 'mode', 'policy')
+
     def __init__(self, cfgRoot=None, root=None, mapper=None, mapperArgs=None, tags=None,
                  mode=None, policy=None):
         try:
@@ -75,14 +94,14 @@ class RepositoryArgs:
             self._cfgRoot = Storage.absolutePath(os.getcwd(), cfgRoot.rstrip(os.sep)) if cfgRoot else cfgRoot
             self._mapper = mapper
             self.mapperArgs = mapperArgs
-            self.tags = set(listify(tags))
+            self.tags = set() if tags is None else set(listify(tags))
             self.mode = mode
             self.policy = Policy(policy) if policy is not None else None
 
     def __repr__(self):
-        return "%s(root=%r, cfgRoot=%r, mapper=%r, mapperArgs=%r, tags=%s, mode=%r, policy=%s)" % (
-            self.__class__.__name__, self.root, self._cfgRoot, self._mapper, self.mapperArgs, self.tags,
-            self.mode, self.policy)
+        return (f"{type(self).__name__}(root={self.root!r}, cfgRoot={self._cfgRoot!r}, "
+                f"mapper={self._mapper!r}, mapperArgs={self.mapperArgs!r}, tags={self.tags}, "
+                f"mode={self.mode!r}, policy={self.policy})")
 
     @property
     def mapper(self):
@@ -104,26 +123,25 @@ class RepositoryArgs:
 
     @staticmethod
     def inputRepo(storage, tags=None):
-        return RepositoryArgs(storage, tags)
+        return RepositoryArgs(root=storage, tags=tags)
 
     @staticmethod
     def outputRepo(storage, mapper=None, mapperArgs=None, tags=None, mode=None):
-        return RepositoryArgs(storage, mapper, mapperArgs, tags, mode)
+        return RepositoryArgs(root=storage, mapper=mapper, mapperArgs=mapperArgs, tags=tags, mode=mode)
 
     def tag(self, tag):
         """add a tag to the repository cfg"""
-        if isinstance(tag, str):
+        if isinstance(tag, str) or not hasattr(tag, '__iter__'):
             self.tags.add(tag)
         else:
-            try:
-                self.tags.update(tag)
-            except TypeError:
-                self.tags.add(tag)
+            self.tags.update(tag)
 
 
 class Repository:
     """Represents a repository of persisted data and has methods to access that data.
     """
+    __slots__ = ('_repoData', '_mapperArgs', '_storage', '_mapper', '_mappers',
+                 '_mapperMap', '_mapperGetKeys', '_mapperQueryMetadata', '_mapperBackup')
 
     def __init__(self, repoData):
         """Initialize a Repository with parameters input via RepoData.
@@ -133,11 +151,58 @@ class Repository:
         repoData : RepoData
             Object that contains the parameters with which to init the Repository.
         """
-        self._storage = Storage.makeFromURI(repoData.cfg.root)
+        # The storage and mapper are made the first time they are used (see __getattr__), so repositories
+        # that are configured but never read from cost little to set up.
+        self._repoData = repoData
         if repoData.cfg.dirty and not repoData.isV1Repository and repoData.cfgOrigin != 'nested':
             self._storage.putRepositoryCfg(repoData.cfg, repoData.cfgRoot)
         self._mapperArgs = repoData.cfg.mapperArgs  # keep for reference in matchesArgs
-        self._initMapper(repoData)
+
+    def __repr__(self):
+        # Don't make the mapper just to describe the repository; object.__getattribute__ bypasses __getattr__.
+        try:
+            mapper = object.__getattribute__(self, '_mapper')
+        except AttributeError:
+            mapper = '<not initialized>'
+        return (f"{type(self).__name__}(root={self._repoData.cfg.root!r}, mapper={mapper!r}, "
+                f"mapperArgs={self._mapperArgs!r})")
+
+    def __getattr__(self, name):
+        """Make the storage or the mapper when it is first accessed.
+
+        Only called for attributes that have not been set yet.
+        """
+        if name == '_storage':
+            self._storage = Storage.makeFromURI(self._repoData.cfg.root)
+            return self._storage
+        if name == '_mapper' or name == '_mappers':
+            self._initMapper(self._repoData)
+            return object.__getattribute__(self, name)
+        if name in _mapperMethods:
+            # Bind the mapper method once, rather than looking it up on each call. Without a mapper, making
+            # it (self._mapper) binds stand-ins, so the methods need not check for one on each call.
+            mapper = self._mapper
+            if mapper is None:
+                return object.__getattribute__(self, name)
+            method = getattr(mapper, _mapperMethods[name])
+            setattr(self, name, method)
+            return method
+        raise AttributeError("%r object has no attribute %r" % (type(self).__name__, name))
+
+    def __getstate__(self):
+        # Only the attributes that have been set; the default would make the storage and mapper (through
+        # __getattr__) just to pickle them.
+        state = {}
+        for name in self.__slots__:
+            try:
+                state[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
 
     def _initMapper(self, repoData):
         '''Initialize and keep the mapper in a member var.
@@ -156,18 +221,22 @@ class Repository:
 
         # if mapper is a string, import it:
         if isinstance(mapper, str):
-            mapper = doImport(mapper)
+            mapperName = mapper
+            mapper = _mapperClassCache.get(mapperName)
+            if mapper is None:
+                mapper = _mapperClassCache[mapperName] = doImport(mapperName)
         # now if mapper is a class type (not instance), instantiate it:
-        if inspect.isclass(mapper):
-            mapperArgs = copy.copy(repoData.cfg.mapperArgs)
-            if mapperArgs is None:
-                mapperArgs = {}
-            if 'root' not in mapperArgs:
-                mapperArgs['root'] = repoData.cfg.root
+        if isinstance(mapper, type):
+            mapperArgs = dict(repoData.cfg.mapperArgs) if repoData.cfg.mapperArgs else {}
+            mapperArgs.setdefault('root', repoData.cfg.root)
             mapper = mapper(parentRegistry=repoData.parentRegistry,
                             repositoryCfg=repoData.cfg,
                             **mapperArgs)
         self._mapper = mapper
+        self._mappers = (mapper, )
+        if mapper is None:
+            self._mapperMap = _raiseNoMapper
+            self._mapperGetKeys = self._mapperQueryMetadata = self._mapperBackup = _returnNone
 
     # todo want a way to make a repository read-only
     def write(self, butlerLocation, obj):
@@ -199,7 +268,7 @@ class Repository:
     # Mapper Access #
 
     def mappers(self):
-        return (self._mapper, )
+        return self._mappers
 
     def getRegistry(self):
         """Get the registry from the mapper
@@ -221,10 +290,7 @@ class Repository:
         :return: A dict of {key:valueType}
         """
         # todo: getKeys is not in the mapper API
-        if self._mapper is None:
-            return None
-        keys = self._mapper.getKeys(*args, **kwargs)
-        return keys
+        return self._mapperGetKeys(*args, **kwargs)
 
     def map(self, *args, **kwargs):
         """Find a butler location for the given arguments.
@@ -234,10 +300,8 @@ class Repository:
         :param kwargs: keyword arguments to be passed on to mapper.map
         :return: The type of item is dependent on the mapper being used but is typically a ButlerLocation.
         """
-        if self._mapper is None:
-            raise RuntimeError("No mapper assigned to Repository")
-        loc = self._mapper.map(*args, **kwargs)
-        if not loc:
+        loc = self._mapperMap(*args, **kwargs)
+        if loc is None:
             return None
         loc.setRepository(self)
         return loc
@@ -252,10 +316,7 @@ class Repository:
         :return:The type of item is dependent on the mapper being used but is typically a set that contains
         available values for the keys in the format input argument.
         """
-        if self._mapper is None:
-            return None
-        ret = self._mapper.queryMetadata(*args, **kwargs)
-        return ret
+        return self._mapperQueryMetadata(*args, **kwargs)
 
     def backup(self, *args, **kwargs):
         """Perform mapper.backup.
@@ -266,9 +327,7 @@ class Repository:
         :param kwargs: keyword arguments to be passed on to mapper.backup
         :return: None
         """
-        if self._mapper is None:
-            return None
-        self._mapper.backup(*args, **kwargs)
+        self._mapperBackup(*args, **kwargs)
 
     def getMapperDefaultLevel(self):
         """Get the default level of the mapper.
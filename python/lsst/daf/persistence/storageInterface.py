@@ -28,7 +28,7 @@ class NoRepositroyAtRoot(RuntimeError):
     pass
 
 
-class StorageInterface:
+class StorageInterface(metaclass=ABCMeta):
     """Defines the interface for a connection to a Storage location.
 
     Parameters
@@ -46,7 +46,6 @@ class StorageInterface:
         If create is False and a repository does not exist at the root
         specified by uri then NoRepositroyAtRoot is raised.
     """
-    __metaclass__ = ABCMeta
 
     def __init__(self, uri, create):
         """initialzer"""
@@ -1,4 +1,2 @@
-from __future__ import absolute_import
-
 from .testLib import *
 from .testLibContinued import *
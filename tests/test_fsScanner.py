@@ -22,6 +22,8 @@
 
 import unittest
 import os
+import shutil
+import tempfile
 import lsst.utils.tests
 from lsst.daf.persistence import FsScanner
 
@@ -43,6 +45,43 @@ class FsScannerTestCase(unittest.TestCase):
         res = scanner.processPath(os.path.join(ROOT, 'testFsScanner'))
         self.assertEqual(res, {'raw_v1_fg.fits.gz': {'visit': 1, 'filter': 'g'}})
 
+    def testIterPaths(self):
+        template = 'raw_v%(visit)d_f%(filter)1s.fits.gz'
+        scanner = FsScanner(template)
+        res = list(scanner.iterPaths(os.path.join(ROOT, 'testFsScanner')))
+        self.assertEqual(res, [('raw_v1_fg.fits.gz', {'visit': 1, 'filter': 'g'})])
+
+    def testProcesses(self):
+        """Test that a scan split across processes finds the same paths as a serial scan.
+
+        The tree has more visit folders than processes, so that the scan expands
+        the top level and walks the visit folders in the process pool."""
+        testDir = tempfile.mkdtemp(dir=ROOT, prefix='testProcesses-')
+        self.addCleanup(shutil.rmtree, testDir)
+        for visit in range(1, 6):
+            visitDir = os.path.join(testDir, 'raw', '%d' % visit)
+            os.makedirs(visitDir)
+            for filterName in 'gr':
+                with open(os.path.join(visitDir, 'raw_v%d_f%s.fits.gz' % (visit, filterName)), 'w'):
+                    pass
+        os.makedirs(os.path.join(testDir, 'raw', 'notAVisit'))
+        template = 'raw/%(visit)d/raw_v%(visit)d_f%(filter)1s.fits.gz'
+        scanner = FsScanner(template)
+        serial = scanner.processPath(testDir)
+        self.assertEqual(len(serial), 10)
+        self.assertEqual(serial['raw/3/raw_v3_fr.fits.gz'], {'visit': 3, 'visit_0': 3, 'filter': 'r'})
+        res = scanner.processPath(testDir, processes=2)
+        self.assertEqual(res, serial)
+
+    def testArrays(self):
+        template = '%(visit)d%(state)1s.fits.fz[%(extension)d]'
+        scanner = FsScanner(template)
+        paths, columns = scanner.processPathArrays(os.path.join(ROOT, 'testFsScanner'))
+        self.assertEqual(paths, ['1038843o.fits.fz'])
+        self.assertEqual(set(columns.keys()), {'visit', 'state'})
+        self.assertEqual(columns['visit'].tolist(), [1038843])
+        self.assertEqual(columns['state'].tolist(), ['o'])
+
 
 class TestMemory(lsst.utils.tests.MemoryTestCase):
     pass
@@ -22,10 +22,12 @@
 
 import os
 import unittest
+import unittest.mock
 import lsst.daf.persistence as dp
 import lsst.utils.tests
 import shutil
 import tempfile
+import yaml
 
 try:
     FileType = file
@@ -66,6 +68,87 @@ class GetParentFromSymlink(unittest.TestCase):
         parentPath = dp.PosixStorage.getParentSymlinkPath(self.parentlessFolderPath)
         self.assertEqual(parentPath, None)
 
+    def testReplacedRepo(self):
+        """Tests that a repository replaced by another folder with the same mtime is probed again."""
+        self.assertIsNotNone(dp.PosixStorage.getParentSymlinkPath(self.childFolderPath))
+        stat = os.stat(self.childFolderPath)
+        os.utime(self.parentlessFolderPath, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        shutil.rmtree(self.childFolderPath)
+        os.rename(self.parentlessFolderPath, self.childFolderPath)
+        self.assertIsNone(dp.PosixStorage.getParentSymlinkPath(self.childFolderPath))
+
+
+class MapperTest(dp.Mapper):
+    pass
+
+
+class TestGetMapperClass(unittest.TestCase):
+    """A test case for getting the mapper class of a Butler v1 repository from its _mapper file."""
+
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp(dir=ROOT, prefix='TestGetMapperClass-')
+        self.parent = os.path.join(self.testDir, 'parent')
+        self.child = os.path.join(self.testDir, 'child')
+        os.makedirs(self.parent)
+        os.makedirs(self.child)
+        os.symlink(self.parent, os.path.join(self.child, '_parent'))
+
+    def tearDown(self):
+        if os.path.exists(self.testDir):
+            shutil.rmtree(self.testDir)
+
+    def _writeMapper(self, root, mapper):
+        # Rewrite the file in place, which does not change the mtime of the folder it is in.
+        with open(os.path.join(root, '_mapper'), 'w') as f:
+            f.write(mapper.__module__ + '.' + mapper.__name__ + '\n')
+
+    def testRewriteInPlace(self):
+        """Tests that a _mapper file rewritten in place is read again."""
+        self._writeMapper(self.parent, dp.Mapper)
+        self.assertIs(dp.PosixStorage.getMapperClass(self.parent), dp.Mapper)
+        self._writeMapper(self.parent, MapperTest)
+        self.assertIs(dp.PosixStorage.getMapperClass(self.parent), MapperTest)
+
+    def testParentMapper(self):
+        """Tests that a change to a _mapper file found through _parent is seen from the child."""
+        self._writeMapper(self.parent, dp.Mapper)
+        self.assertIs(dp.PosixStorage.getMapperClass(self.child), dp.Mapper)
+        self._writeMapper(self.parent, MapperTest)
+        self.assertIs(dp.PosixStorage.getMapperClass(self.child), MapperTest)
+
+    def testNoMapper(self):
+        """Tests that a _mapper file added to a repository that had none is found."""
+        self.assertIsNone(dp.PosixStorage.getMapperClass(self.parent))
+        self._writeMapper(self.parent, MapperTest)
+        self.assertIs(dp.PosixStorage.getMapperClass(self.parent), MapperTest)
+
+
+class TestSearchParents(unittest.TestCase):
+    """A test case for PosixStorage.search following _parent links."""
+
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp(dir=ROOT, prefix='TestSearchParents-')
+        self.parent = os.path.join(self.testDir, 'parent')
+        self.child = os.path.join(self.testDir, 'child')
+        os.makedirs(self.parent)
+        os.makedirs(self.child)
+        os.symlink(self.parent, os.path.join(self.child, '_parent'))
+
+    def tearDown(self):
+        if os.path.exists(self.testDir):
+            shutil.rmtree(self.testDir)
+
+    def testParentAddedBelowRoot(self):
+        """Tests that a _parent link added to a parent after a search is followed by later searches."""
+        self.assertIsNone(dp.PosixStorage.search(self.child, 'bar.fits', searchParents=True))
+        grandparent = os.path.join(self.testDir, 'grandparent')
+        os.makedirs(grandparent)
+        with open(os.path.join(grandparent, 'bar.fits'), 'w') as f:
+            f.write('bar')
+        os.symlink(grandparent, os.path.join(self.parent, '_parent'))
+        self.assertEqual(dp.PosixStorage.search(self.child, 'bar.fits', searchParents=True),
+                         ['_parent/_parent/bar.fits'])
+
 
 class TestRelativePath(unittest.TestCase):
     """A test case for the PosixStorage.relativePath function."""
@@ -141,6 +224,141 @@ class TestGetLocalFile(unittest.TestCase):
         self.assertEqual(f.read(), 'foobarbaz')
         f.close()
 
+    def testBinary(self):
+        """Tests that GetLocalFile can return a file opened in binary mode."""
+        storage = dp.PosixStorage(self.testDir, create=True)
+        with open(os.path.join(self.testDir, 'foo.txt'), 'w') as f:
+            f.write('foobarbaz')
+        with storage.getLocalFile('foo.txt', binary=True) as f:
+            self.assertEqual(f.read(), b'foobarbaz')
+            self.assertEqual(f.name, os.path.join(self.testDir, 'foo.txt'))
+
+
+class TestCopyFile(unittest.TestCase):
+    """A test case for the PosixStorage.copyFile function."""
+
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp(dir=ROOT, prefix='TestCopyFile-')
+        self.storage = dp.PosixStorage(self.testDir, create=True)
+        self.data = os.urandom(3 << 20)
+        with open(os.path.join(self.testDir, 'foo.bin'), 'wb') as f:
+            f.write(self.data)
+        os.chmod(os.path.join(self.testDir, 'foo.bin'), 0o640)
+
+    def tearDown(self):
+        if os.path.exists(self.testDir):
+            shutil.rmtree(self.testDir)
+
+    def _read(self, path):
+        with open(os.path.join(self.testDir, path), 'rb') as f:
+            return f.read()
+
+    def testCopy(self):
+        """Tests that the contents and permission bits are copied, and that an existing file is replaced."""
+        with open(os.path.join(self.testDir, 'bar.bin'), 'wb') as f:
+            f.write(b'x' * (4 << 20))
+        self.storage.copyFile('foo.bin', 'bar.bin')
+        self.assertEqual(self._read('bar.bin'), self.data)
+        self.assertEqual(os.stat(os.path.join(self.testDir, 'bar.bin')).st_mode & 0o777, 0o640)
+
+    def testCopyIntoDirectory(self):
+        """Tests that copying to a directory puts the file in it, with the same name."""
+        os.makedirs(os.path.join(self.testDir, 'sub'))
+        self.storage.copyFile('foo.bin', 'sub')
+        self.assertEqual(self._read(os.path.join('sub', 'foo.bin')), self.data)
+
+    def testCopyFileRangeCopiesNothing(self):
+        """Tests that the whole file is copied when os.copy_file_range returns without copying anything."""
+        with unittest.mock.patch('os.copy_file_range', return_value=0, create=True):
+            self.storage.copyFile('foo.bin', 'bar.bin')
+        self.assertEqual(self._read('bar.bin'), self.data)
+        self.assertEqual(os.stat(os.path.join(self.testDir, 'bar.bin')).st_mode & 0o777, 0o640)
+
+    def testSameFile(self):
+        """Tests that copying a file onto itself raises and leaves the file intact."""
+        with self.assertRaises(shutil.SameFileError):
+            self.storage.copyFile('foo.bin', 'foo.bin')
+        self.assertEqual(self._read('foo.bin'), self.data)
+        os.symlink('foo.bin', os.path.join(self.testDir, 'link.bin'))
+        with self.assertRaises(shutil.SameFileError):
+            self.storage.copyFile('foo.bin', 'link.bin')
+        self.assertEqual(self._read('foo.bin'), self.data)
+
+
+class TestSearch(unittest.TestCase):
+    """A test case for PosixStorage.search with absolute paths."""
+
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp(dir=ROOT, prefix='TestSearch-')
+        self.parent = os.path.join(self.testDir, 'parent')
+        self.child = os.path.join(self.testDir, 'child')
+        self.alias = os.path.join(self.testDir, 'alias')
+        os.makedirs(self.parent)
+        os.makedirs(self.child)
+        os.symlink(self.parent, os.path.join(self.child, '_parent'))
+        os.symlink(self.child, self.alias)
+        with open(os.path.join(self.parent, 'foo.fits'), 'w') as f:
+            f.write('foo')
+
+    def tearDown(self):
+        if os.path.exists(self.testDir):
+            shutil.rmtree(self.testDir)
+
+    def testPathThroughAlias(self):
+        """Tests that an absolute path through a link to root is made relative to root, even when it
+        continues through a link out of root."""
+        self.assertEqual(dp.PosixStorage.search(self.child, os.path.join(self.alias, '_parent', 'foo.fits')),
+                         ['_parent/foo.fits'])
+        storage = dp.PosixStorage(self.alias, create=False)
+        self.assertTrue(storage.exists(os.path.join(self.child, '_parent', 'foo.fits')))
+        self.assertFalse(storage.exists(os.path.join(self.child, '_parent', 'bar.fits')))
+
+
+class Uncopyable:
+    """An object that can be read from YAML but can not be copied or pickled."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __reduce_ex__(self, protocol):
+        raise TypeError("cannot pickle 'Uncopyable' object")
+
+
+def constructUncopyable(loader, node):
+    return Uncopyable(loader.construct_scalar(node))
+
+
+class TestReadYaml(unittest.TestCase):
+    """A test case for reading objects from YamlStorage."""
+
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp(dir=ROOT, prefix='TestReadYaml-')
+        self.storage = dp.PosixStorage(self.testDir, create=True)
+        try:
+            self.loader = yaml.UnsafeLoader
+        except AttributeError:
+            self.loader = yaml.Loader
+        yaml.add_constructor('!Uncopyable', constructUncopyable, Loader=self.loader)
+        with open(os.path.join(self.testDir, 'foo.yaml'), 'w') as f:
+            f.write('!Uncopyable foo\n')
+
+    def tearDown(self):
+        del self.loader.yaml_constructors['!Uncopyable']
+        if os.path.exists(self.testDir):
+            shutil.rmtree(self.testDir)
+
+    def testUncopyable(self):
+        """Tests that an object that can not be copied is read, and read again as a new object."""
+        location = dp.ButlerLocation(pythonType=Uncopyable, cppType=None, storageName='YamlStorage',
+                                     locationList=['foo.yaml'], dataId={}, mapper=None,
+                                     storage=self.storage)
+        first = self.storage.read(location)[0]
+        self.assertIsInstance(first, Uncopyable)
+        self.assertEqual(first.value, 'foo')
+        second = self.storage.read(location)[0]
+        self.assertIsInstance(second, Uncopyable)
+        self.assertIsNot(first, second)
+
 
 class MemoryTester(lsst.utils.tests.MemoryTestCase):
     pass
@@ -24,8 +24,10 @@
 
 import os
 import astropy.io.fits
+import pickle
 import shutil
 import sqlite3
+import types
 import unittest
 import tempfile
 
@@ -1043,6 +1045,81 @@ class TestOldButlerParentTagging(unittest.TestCase):
         del butler
 
 
+class CountingMapper(dp.Mapper):
+    """Mapper that counts how many times it has been instantiated."""
+
+    instances = 0
+
+    def __init__(self, root, **kwargs):
+        CountingMapper.instances += 1
+        self.root = root
+
+    def map_raw(self, dataId, write):
+        return None
+
+    def getKeys(self, datasetType, level):
+        return {'visit': int}
+
+
+class BrokenMapper(dp.Mapper):
+    """Mapper whose constructor fails with an AttributeError."""
+
+    def __init__(self, **kwargs):
+        raise AttributeError("BrokenMapper could not be made")
+
+
+class TestLazyRepository(unittest.TestCase):
+    """Tests that a Repository makes its storage and mapper only when they are first used."""
+
+    def setUp(self):
+        self.testDir = tempfile.mkdtemp(dir=ROOT, prefix='TestLazyRepository-')
+        CountingMapper.instances = 0
+
+    def tearDown(self):
+        if os.path.exists(self.testDir):
+            shutil.rmtree(self.testDir)
+
+    def _makeRepository(self, mapper):
+        cfg = types.SimpleNamespace(root=self.testDir, mapper=mapper, mapperArgs=None, dirty=False)
+        repoData = types.SimpleNamespace(cfg=cfg, isV1Repository=False, cfgOrigin='existing',
+                                         parentRegistry=None)
+        return dp.Repository(repoData)
+
+    def testLazy(self):
+        repo = self._makeRepository(CountingMapper)
+        self.assertEqual(CountingMapper.instances, 0)
+        self.assertIn('<not initialized>', repr(repo))
+        self.assertIsNone(repo.map('raw', {'visit': 1}))
+        self.assertEqual(CountingMapper.instances, 1)
+        self.assertEqual(repo.getKeys('raw', None), {'visit': int})
+        self.assertIsInstance(repo.mappers()[0], CountingMapper)
+        self.assertEqual(CountingMapper.instances, 1)
+        self.assertNotIn('<not initialized>', repr(repo))
+
+    def testNoMapper(self):
+        repo = self._makeRepository(None)
+        with self.assertRaises(RuntimeError):
+            repo.map('raw', {'visit': 1})
+        self.assertIsNone(repo.getKeys('raw', None))
+        self.assertIsNone(repo.queryMetadata('raw', ('visit',), {}))
+        self.assertIsNone(repo.backup('raw', {'visit': 1}))
+        self.assertEqual(repo.mappers(), (None, ))
+
+    def testPickleUninitialized(self):
+        repo = pickle.loads(pickle.dumps(self._makeRepository(CountingMapper)))
+        self.assertEqual(CountingMapper.instances, 0)
+        self.assertIn('<not initialized>', repr(repo))
+        self.assertIsInstance(repo.mappers()[0], CountingMapper)
+        self.assertEqual(CountingMapper.instances, 1)
+
+    def testMapperAttributeError(self):
+        repo = self._makeRepository(BrokenMapper)
+        with self.assertRaisesRegex(AttributeError, "BrokenMapper could not be made"):
+            repo.map('raw', {'visit': 1})
+        with self.assertRaisesRegex(AttributeError, "BrokenMapper could not be made"):
+            repo.mappers()
+
+
 class MemoryTester(lsst.utils.tests.MemoryTestCase):
     pass
 
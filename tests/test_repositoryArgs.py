@@ -161,6 +161,24 @@ class ParseRootURI(unittest.TestCase):
             self.fail("Butler init raised a runtime error loading input %s" % uri)
 
 
+class RepoFactories(unittest.TestCase):
+    """Verify the inputRepo and outputRepo factories pass their arguments to the right parameters."""
+
+    def testInputRepo(self):
+        args = dp.RepositoryArgs.inputRepo('/foo', tags='bar')
+        self.assertEqual(args.root, '/foo')
+        self.assertEqual(args.tags, {'bar'})
+
+    def testOutputRepo(self):
+        args = dp.RepositoryArgs.outputRepo('/foo', mapper='lsst.daf.persistence.Mapper', tags=('bar', 'baz'),
+                                            mode='rw')
+        self.assertEqual(args.root, '/foo')
+        self.assertEqual(args.mapper, 'lsst.daf.persistence.Mapper')
+        self.assertIsNone(args.mapperArgs)
+        self.assertEqual(args.tags, {'bar', 'baz'})
+        self.assertEqual(args.mode, 'rw')
+
+
 class MemoryTester(lsst.utils.tests.MemoryTestCase):
     pass
 
@@ -193,6 +193,18 @@ class TestNestedCfg(unittest.TestCase):
         self.assertEqual(cfg, reloadedCfg)
         self.assertEqual(cfg.parents[0], parentCfg)
 
+    def testRootSpelling(self):
+        """Verify that a cfg that does not record its root gets the root it was read through, when the same
+        repository is read through different spellings of its root."""
+        cfg = dp.RepositoryCfg(root=self.testDir,
+                               mapper='lsst.daf.persistence.SomeMapper',
+                               mapperArgs={},
+                               parents=None,
+                               policy=None)
+        dp.PosixStorage.putRepositoryCfg(cfg)
+        for root in (self.testDir + '/', self.testDir, self.testDir + '/'):
+            self.assertEqual(dp.PosixStorage.getRepositoryCfg(root).root, root)
+
 
 # "fake" repository version 0
 class RepositoryCfg(yaml.YAMLObject):
@@ -237,6 +249,19 @@ class TestCfgFileVersion(unittest.TestCase):
         cfg = dp.PosixStorage.getRepositoryCfg(self.testDir)
         self.assertIsInstance(cfg, dp.RepositoryCfg)
 
+    def testLateConstructor(self):
+        """Verify that a constructor registered on the python loader after the formatter was imported is used
+        to read a cfg."""
+        loader = loaderList[-1]
+        self.addCleanup(setattr, loader, 'yaml_constructors', loader.yaml_constructors.copy())
+        yaml.add_constructor(u"!RepositoryCfg_vLate", RepositoryCfg.v0Constructor, Loader=loader)
+        with open(os.path.join(self.testDir, 'repositoryCfg.yaml'), 'w') as f:
+            f.write("""!RepositoryCfg_vLate
+                    _root: 'foo/bar'""")
+        cfg = dp.PosixStorage.getRepositoryCfg(self.testDir)
+        self.assertIsInstance(cfg, dp.RepositoryCfg)
+        self.assertEqual(cfg.root, 'foo/bar')
+
 
 class TestExtendParents(unittest.TestCase):
     """Test for the RepositoryCfg.extendParents function.